@@ -3,13 +3,29 @@ import matplotlib.pyplot as plt
 import json
 import os
 
-def load_mot_file(file_path):
+from mot_columnar import MOT_COLUMNS, SUMMARY_DTYPES, columnar_format, read_mot_table, write_columnar
+
+def load_mot_file(file_path, frame_range=None, videos=None, kinds=None, runs=None):
     """
     Load MOT file into a DataFrame.
     Columns: frame, id, x, y, w, h, conf, class, x3d, y3d
+
+    Text files are parsed with pandas. Parquet/Feather files (or a directory
+    tree of them) are read with the frame range, video, kind ("gt"/"tracking")
+    and run filters pushed down to the reader; columnar files also carry
+    "video", "kind" and "run" columns. Files in a directory that are not MOT
+    tables, such as frame-wise summaries, are skipped.
     """
+    if os.path.isdir(file_path) or columnar_format(file_path):
+        return read_mot_table(file_path, frame_range=frame_range, videos=videos, kinds=kinds, runs=runs)
+
+    if videos is not None or kinds is not None or runs is not None:
+        raise ValueError(f"Text MOT files have no video, kind or run columns to filter on: {file_path}")
+
     df = pd.read_csv(file_path, header=None)
-    df.columns = ["frame", "id", "x", "y", "w", "h", "conf", "class", "x3d", "y3d"]
+    df.columns = MOT_COLUMNS
+    if frame_range is not None:
+        df = df[df["frame"].between(*frame_range)]
     return df
 
 def evaluate_per_frame(gt_df, pred_df, max_frame=None):
@@ -68,7 +84,11 @@ def plot_metric_over_time(results_df, output_dir):
     plt.close()
     print(f"[✓] Saved plot: {plot_path}")
 
-def save_summary_to_csv_json(results_df, output_dir):
+def save_summary_to_csv_json(results_df, output_dir, binary_format=None):
+    """
+    Save the frame-wise summary as CSV and JSON, and optionally as a typed
+    columnar file when binary_format is "parquet" or "feather".
+    """
     csv_path = os.path.join(output_dir, "framewise_summary.csv")
     json_path = os.path.join(output_dir, "framewise_summary.json")
 
@@ -78,6 +98,11 @@ def save_summary_to_csv_json(results_df, output_dir):
     print(f"[✓] Saved CSV: {csv_path}")
     print(f"[✓] Saved JSON: {json_path}")
 
+    if binary_format:
+        columnar_path = os.path.join(output_dir, f"framewise_summary.{binary_format}")
+        write_columnar(results_df, columnar_path, dtypes=SUMMARY_DTYPES)
+        print(f"[✓] Saved {binary_format.capitalize()}: {columnar_path}")
+
 if __name__ == "__main__":
     tracking_file = "mot_output/6378f45d-vehicle-counting_tracking.txt"
     gt_file = "mot_output/6378f45d-vehicle-counting_gt.txt"
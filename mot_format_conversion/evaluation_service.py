@@ -0,0 +1,492 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from Evaluation_tracking_Analysis import evaluate_per_frame, save_summary_to_csv_json
+from main_MOTConvert import interpolate_mot_entries, video_to_mot_rows, write_mot_rows
+from mot_columnar import format_extension, to_mot_table
+
+# Keys of the entry dicts used by interpolate_mot_entries, in MOT column order
+MOT_ENTRY_KEYS = ("frame", "id", "x", "y", "width", "height", "conf", "class", "x3d", "y3d")
+
+# Sub-directories of the job queue
+QUEUE_DIRS = ("incoming", "running", "done", "failed", "results")
+
+# Lock file that allows a single service per queue
+LOCK_FILE = "service.pid"
+
+
+def mot_rows_for_video(video: Dict[str, Any], interpolate: bool = True,
+                       default_id: Optional[int] = None) -> List[tuple]:
+    """
+    Convert one video entry to frame-sorted MOT rows, optionally interpolating
+    missing frames (same steps as convert_to_mot_format and interpolate_mot_data).
+    See video_to_mot_rows for default_id.
+    """
+    rows = video_to_mot_rows(video, default_id=default_id)
+    rows.sort(key=lambda x: x[0])
+    if interpolate and rows:
+        entries = interpolate_mot_entries([dict(zip(MOT_ENTRY_KEYS, row)) for row in rows])
+        rows = [tuple(entry[key] for key in MOT_ENTRY_KEYS) for entry in entries]
+    return rows
+
+
+def load_gt_sequences(gt_path: str, interpolate: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Parse a ground truth JSON file into MOT tables keyed by video path.
+    """
+    with open(gt_path, 'r') as f:
+        gt_data = json.load(f)
+
+    return {
+        gt_video['video']: to_mot_table(mot_rows_for_video(gt_video, interpolate, default_id=-1))
+        for gt_video in gt_data
+    }
+
+
+def summarize_results(results_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Aggregate a frame-wise summary into totals and overall precision, recall and MOTA.
+    """
+    tp = int(results_df["TP"].sum()) if len(results_df) else 0
+    fp = int(results_df["FP"].sum()) if len(results_df) else 0
+    fn = int(results_df["FN"].sum()) if len(results_df) else 0
+    num_gt = tp + fn
+
+    return {
+        "frames": int(len(results_df)),
+        "TP": tp,
+        "FP": fp,
+        "FN": fn,
+        "precision": tp / (tp + fp) if (tp + fp) else 0,
+        "recall": tp / num_gt if num_gt else 0,
+        "mota": 1 - (fn + fp) / num_gt if num_gt else 0,
+    }
+
+
+def evaluate_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run conversion, interpolation and evaluation for one job.
+
+    Runs in a worker process, taking parsed GT from the worker's cache.
+    Per-video outputs (MOT tracking file and frame-wise summary) are written
+    under <output_dir>/<video_name>/.
+
+    Args:
+        job: Job description (see submit_job)
+
+    Returns:
+        Result dict with per-video metrics and videos that had no ground truth
+    """
+    # Keep stdout for the service's result stream
+    with contextlib.redirect_stdout(sys.stderr):
+        return _evaluate_job(job)
+
+
+def _evaluate_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    gt_sequences, gt_cached = worker_gt_sequences(job["gt_path"], job.get("interpolate", True))
+    output_format = job.get("output_format", "txt")
+    interpolate = job.get("interpolate", True)
+    ext = format_extension(output_format)
+
+    with open(job["tracking_path"], 'r') as f:
+        tracking_data = json.load(f)
+
+    videos = {}
+    missing_gt = []
+    for tracking_video in tracking_data:
+        video_path = tracking_video['video']
+        video_name = os.path.basename(video_path).split('.')[0]
+
+        gt_df = gt_sequences.get(video_path)
+        if gt_df is None:
+            missing_gt.append(video_path)
+            continue
+
+        video_dir = os.path.join(job["output_dir"], video_name)
+        os.makedirs(video_dir, exist_ok=True)
+
+        rows = mot_rows_for_video(tracking_video, interpolate)
+        write_mot_rows(rows, os.path.join(video_dir, f"{video_name}_tracking{ext}"),
+                       video=video_name, kind="tracking", run=job["job_id"])
+
+        results_df = evaluate_per_frame(gt_df, to_mot_table(rows))
+        save_summary_to_csv_json(results_df, video_dir,
+                                 binary_format=None if output_format == "txt" else output_format)
+        videos[video_name] = summarize_results(results_df)
+
+    return {
+        "job_id": job["job_id"],
+        "status": "done",
+        "output_dir": job["output_dir"],
+        "videos": videos,
+        "missing_gt": missing_gt,
+        "gt_cached": gt_cached,
+    }
+
+
+class QueueLockedError(RuntimeError):
+    """Raised when another service already serves the queue."""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists but owned by another user
+    return True
+
+
+class GTCache:
+    """
+    Least-recently-used cache of parsed ground truth sequences.
+
+    Keys include the file modification time, so an edited GT file is re-parsed.
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple, Dict[str, pd.DataFrame]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[Dict[str, pd.DataFrame]]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple, value: Dict[str, pd.DataFrame]) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+# Per-process GT cache, set up in each worker by _init_worker
+_worker_gt_cache: Optional[GTCache] = None
+
+
+def _init_worker(cache_size: int) -> None:
+    global _worker_gt_cache
+    _worker_gt_cache = GTCache(cache_size)
+
+
+def worker_gt_sequences(gt_path: str, interpolate: bool = True) -> Tuple[Dict[str, pd.DataFrame], bool]:
+    """
+    Return parsed GT from this process's cache, parsing it on a miss.
+
+    Returns:
+        Tuple (gt_sequences, cache_hit)
+    """
+    global _worker_gt_cache
+    if _worker_gt_cache is None:
+        _worker_gt_cache = GTCache()
+
+    gt_path = os.path.abspath(gt_path)
+    key = (gt_path, os.stat(gt_path).st_mtime_ns, interpolate)
+
+    gt_sequences = _worker_gt_cache.get(key)
+    if gt_sequences is not None:
+        return gt_sequences, True
+    gt_sequences = load_gt_sequences(gt_path, interpolate)
+    _worker_gt_cache.put(key, gt_sequences)
+    return gt_sequences, False
+
+
+class EvaluationService:
+    """
+    Asyncio service that evaluates jobs from a local directory queue.
+
+    Jobs are JSON files dropped into <queue_dir>/incoming/ (see submit_job).
+    Each job is claimed by moving it to running/, evaluated on a process pool,
+    and its result is written to results/<job_id>.json and printed as one JSON
+    line as soon as it finishes. The job file then moves to done/ or failed/.
+    Each worker process keeps parsed GT in its own LRU cache, shared by all
+    jobs it runs, so GT tables are never sent between processes.
+
+    Only one service may serve a queue at a time; this is enforced with a
+    service.pid lock file in the queue directory.
+
+    If a worker process dies (e.g. killed for running out of memory), the
+    pool is recreated and the jobs it was running go back to incoming/. Those
+    jobs are then run one at a time, so a job that breaks the pool on its own
+    can be told apart from the others; after max_crashes such runs it is
+    marked failed.
+    """
+
+    def __init__(self, queue_dir: str, workers: Optional[int] = None,
+                 cache_size: int = 8, poll_interval: float = 1.0, max_crashes: int = 3):
+        self.queue_dir = queue_dir
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.cache_size = cache_size
+        self.max_crashes = max_crashes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_broken = False
+        self._crashes: Dict[str, int] = {}
+        self._suspects: Set[str] = set()  # Jobs requeued from a broken pool
+
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.queue_dir, *parts)
+
+    def _acquire_lock(self) -> None:
+        """
+        Create the queue's service.pid lock file, replacing it if the service
+        that wrote it is no longer running.
+
+        The PID is written to a temporary file first and hard-linked into
+        place, so the lock file never exists without its PID and a service
+        that is still starting up is never mistaken for a stale one.
+        """
+        lock_path = self._path(LOCK_FILE)
+        pid_path = f"{lock_path}.{os.getpid()}.tmp"
+        with open(pid_path, 'w') as f:
+            f.write(str(os.getpid()))
+        try:
+            for _ in range(2):
+                try:
+                    os.link(pid_path, lock_path)
+                    return
+                except FileExistsError:
+                    pass
+
+                pid_text = self._read_lock()
+                if pid_text is None:
+                    continue  # Released since the link attempt
+                if pid_text.isdigit() and _pid_alive(int(pid_text)):
+                    raise QueueLockedError(f"Queue {self.queue_dir} is already served by process {pid_text}")
+                # Only remove the stale lock if no other service replaced it meanwhile
+                if self._read_lock() == pid_text:
+                    self._release_lock()
+            raise QueueLockedError(f"Could not lock queue {self.queue_dir}")
+        finally:
+            os.remove(pid_path)
+
+    def _read_lock(self) -> Optional[str]:
+        try:
+            with open(self._path(LOCK_FILE), 'r') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def _release_lock(self) -> None:
+        try:
+            os.remove(self._path(LOCK_FILE))
+        except FileNotFoundError:
+            pass
+
+    def _incoming_jobs(self) -> List[str]:
+        incoming = self._path("incoming")
+        jobs = []
+        for name in os.listdir(incoming):
+            if not name.endswith(".json"):
+                continue
+            try:
+                jobs.append((os.path.getmtime(os.path.join(incoming, name)), name))
+            except FileNotFoundError:
+                continue  # Withdrawn from the queue since the listing
+        return [name for _, name in sorted(jobs)]
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.cache_size,))
+
+    async def _process(self, name: str) -> Optional[Dict[str, Any]]:
+        running_path = self._path("running", name)
+        job_id = os.path.splitext(name)[0]
+        try:
+            with open(running_path, 'r') as f:
+                job = json.load(f)
+            job.setdefault("job_id", job_id)
+            job.setdefault("output_dir", self._path("results", job_id))
+
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool, evaluate_job, job)
+            final_dir = "done"
+        except BrokenProcessPool as e:
+            self._pool_broken = True
+            if name in self._suspects:
+                # Suspects run alone, so this job broke the pool itself
+                self._crashes[name] = self._crashes.get(name, 0) + 1
+            if self._crashes.get(name, 0) < self.max_crashes:
+                self._suspects.add(name)
+                print(f"Warning: worker pool broke while running {job_id}, requeueing it", file=sys.stderr)
+                try:
+                    os.replace(running_path, self._path("incoming", name))
+                except FileNotFoundError:
+                    pass
+                return None
+            result = {"job_id": job_id, "status": "failed", "error": f"{type(e).__name__}: {e}"}
+            final_dir = "failed"
+        except Exception as e:
+            result = {"job_id": job_id, "status": "failed", "error": f"{type(e).__name__}: {e}"}
+            final_dir = "failed"
+        self._suspects.discard(name)
+        self._crashes.pop(name, None)
+
+        result_path = self._path("results", f"{job_id}.json")
+        with open(result_path + ".tmp", 'w') as f:
+            json.dump(result, f, indent=2)
+        os.replace(result_path + ".tmp", result_path)
+        try:
+            os.replace(running_path, self._path(final_dir, name))
+        except FileNotFoundError:
+            print(f"Warning: job file {running_path} was removed while the job ran", file=sys.stderr)
+
+        print(json.dumps(result), flush=True)
+        return result
+
+    async def run(self, once: bool = False) -> None:
+        """
+        Poll the queue and evaluate jobs until cancelled, or until the queue is
+        drained when once is True.
+        """
+        for sub_dir in QUEUE_DIRS:
+            os.makedirs(self._path(sub_dir), exist_ok=True)
+
+        self._acquire_lock()
+        try:
+            await self._serve(once)
+        finally:
+            self._release_lock()
+
+    async def _serve(self, once: bool) -> None:
+        # Holding the lock means no other service is running, so anything left
+        # in running/ belongs to an interrupted service: requeue it
+        for name in os.listdir(self._path("running")):
+            os.replace(self._path("running", name), self._path("incoming", name))
+
+        tasks = set()
+        self._pool = self._new_pool()
+        try:
+            while True:
+                if self._pool_broken:
+                    # Let the other jobs of the broken pool requeue, then start a new pool
+                    if tasks:
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                    self._pool.shutdown(wait=False)
+                    self._pool = self._new_pool()
+                    self._pool_broken = False
+
+                names = self._incoming_jobs()
+                if not tasks:
+                    self._suspects &= set(names)  # Forget suspects withdrawn from the queue
+                if self._suspects:
+                    # Run the jobs of a broken pool one at a time
+                    names = [] if tasks else [name for name in names if name in self._suspects][:1]
+
+                for name in names:
+                    try:
+                        os.replace(self._path("incoming", name), self._path("running", name))
+                    except FileNotFoundError:
+                        continue  # Withdrawn from the queue since the scan
+                    task = asyncio.create_task(self._process(name))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                if once and not tasks and not self._incoming_jobs():
+                    break
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            self._pool.shutdown()
+            self._pool = None
+
+
+def submit_job(queue_dir: str, tracking_path: str, gt_path: str, output_dir: Optional[str] = None,
+               output_format: str = "txt", interpolate: bool = True,
+               job_id: Optional[str] = None) -> str:
+    """
+    Submit an evaluation job to a directory queue.
+
+    Args:
+        queue_dir: Queue directory served by EvaluationService
+        tracking_path: Path to the tracking JSON file
+        gt_path: Path to the ground truth JSON file
+        output_dir: Directory for per-video outputs (default: <queue_dir>/results/<job_id>)
+        output_format: "txt", "parquet" or "feather" for the MOT and summary outputs
+        interpolate: Interpolate missing frames before evaluation
+        job_id: Job identifier (default: random)
+
+    Returns:
+        The job ID; the result is written to <queue_dir>/results/<job_id>.json
+    """
+    format_extension(output_format)  # Validate the format before queueing
+    job_id = job_id or uuid.uuid4().hex[:12]
+    job = {
+        "job_id": job_id,
+        "tracking_path": os.path.abspath(tracking_path),
+        "gt_path": os.path.abspath(gt_path),
+        "output_dir": os.path.abspath(output_dir or os.path.join(queue_dir, "results", job_id)),
+        "output_format": output_format,
+        "interpolate": interpolate,
+    }
+
+    incoming = os.path.join(queue_dir, "incoming")
+    os.makedirs(incoming, exist_ok=True)
+    job_path = os.path.join(incoming, f"{job_id}.json")
+    with open(job_path + ".tmp", 'w') as f:
+        json.dump(job, f, indent=2)
+    os.replace(job_path + ".tmp", job_path)
+    return job_id
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local MOT evaluation job queue")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Evaluate queued jobs on a process pool")
+    serve.add_argument("--queue-dir", default="eval_queue")
+    serve.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    serve.add_argument("--cache-size", type=int, default=8, help="Number of GT files kept parsed per worker")
+    serve.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between queue scans")
+    serve.add_argument("--max-crashes", type=int, default=3,
+                       help="Times a job may break the worker pool before it is marked failed")
+    serve.add_argument("--once", action="store_true", help="Exit once the queue is drained")
+
+    submit = subparsers.add_parser("submit", help="Add a job to the queue")
+    submit.add_argument("--queue-dir", default="eval_queue")
+    submit.add_argument("--tracking", required=True, help="Tracking JSON file")
+    submit.add_argument("--gt", required=True, help="Ground truth JSON file")
+    submit.add_argument("--output-dir", default=None)
+    submit.add_argument("--format", dest="output_format", default="txt",
+                        choices=["txt", "parquet", "feather"])
+    submit.add_argument("--no-interpolate", dest="interpolate", action="store_false")
+    submit.add_argument("--job-id", default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        service = EvaluationService(args.queue_dir, workers=args.workers,
+                                    cache_size=args.cache_size, poll_interval=args.poll_interval,
+                                    max_crashes=args.max_crashes)
+        try:
+            asyncio.run(service.run(once=args.once))
+        except QueueLockedError as e:
+            parser.exit(1, f"{e}\n")
+        except KeyboardInterrupt:
+            pass
+    else:
+        job_id = submit_job(args.queue_dir, args.tracking, args.gt, output_dir=args.output_dir,
+                            output_format=args.output_format, interpolate=args.interpolate,
+                            job_id=args.job_id)
+        print(job_id)
+
+
+if __name__ == "__main__":
+    main()
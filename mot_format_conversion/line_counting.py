@@ -0,0 +1,274 @@
+import json
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from main_MOTConvert import video_to_mot_rows
+from mot_columnar import to_mot_table
+
+# Counting line used in Track_and_count_vehicles_with_yolov8.ipynb (3840x2160 video)
+LINE_START = (50, 1500)
+LINE_END = (3840 - 50, 1500)
+
+# Class IDs assigned by video_to_mot_rows
+CLASS_NAMES = {1: "car", 2: "truck"}
+
+EVENT_COLUMNS = ["counter", "video", "id", "class", "frame", "direction"]
+
+# Columns that counts are grouped by
+COUNT_KEYS = ["counter", "video", "class", "direction"]
+
+Point = Tuple[float, float]
+
+
+def load_track_table(json_path: str, default_id: Optional[int] = None) -> pd.DataFrame:
+    """
+    Load a tracking or ground truth JSON file into one MOT table with a "video" column.
+    Pass default_id=-1 for ground truth objects that may lack an ID (see video_to_mot_rows).
+    """
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    tables = []
+    for video in data:
+        video_name = os.path.basename(video['video']).split('.')[0]
+        tables.append(to_mot_table(video_to_mot_rows(video, default_id=default_id), video=video_name))
+    return pd.concat(tables, ignore_index=True) if tables else to_mot_table([])
+
+
+def track_steps(df: pd.DataFrame, anchor: str = "center"):
+    """
+    Turn a track table into trajectory steps between consecutive detections of each track.
+
+    Args:
+        df: MOT table with frame, id, x, y, w, h, class and optional video columns
+        anchor: Box point that is tracked: "center" or "bottom_center"
+
+    Returns:
+        Tuple (start_points, end_points, rows) where start_points/end_points are
+        (N, 2) arrays and rows is the table row at the end of each step
+    """
+    if anchor == "center":
+        anchor_y = df["y"].to_numpy(np.float64) + df["h"].to_numpy(np.float64) / 2
+    elif anchor == "bottom_center":
+        anchor_y = df["y"].to_numpy(np.float64) + df["h"].to_numpy(np.float64)
+    else:
+        raise ValueError(f"Unsupported anchor: {anchor}")
+    anchor_x = df["x"].to_numpy(np.float64) + df["w"].to_numpy(np.float64) / 2
+
+    if "video" in df.columns:
+        video_codes = pd.factorize(df["video"])[0]
+    else:
+        video_codes = np.zeros(len(df), dtype=np.int64)
+    ids = df["id"].to_numpy()
+    frames = df["frame"].to_numpy()
+
+    # Sort by video, track and frame, then keep steps within the same track
+    order = np.lexsort((frames, ids, video_codes))
+    points = np.column_stack((anchor_x, anchor_y))[order]
+    same_track = (video_codes[order][1:] == video_codes[order][:-1]) & (ids[order][1:] == ids[order][:-1])
+
+    rows = df.iloc[order[1:][same_track]]
+    return points[:-1][same_track], points[1:][same_track], rows
+
+
+def _cross(origin: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Z component of (a - origin) x (b - origin), broadcast over rows.
+    """
+    return ((a[..., 0] - origin[..., 0]) * (b[..., 1] - origin[..., 1])
+            - (a[..., 1] - origin[..., 1]) * (b[..., 0] - origin[..., 0]))
+
+
+def line_crossings(starts: np.ndarray, ends: np.ndarray, line_start: Point, line_end: Point) -> np.ndarray:
+    """
+    Find trajectory steps that cross a line segment.
+
+    A point exactly on the line counts as being on its negative side, so a
+    trajectory touching the line and moving on is counted once.
+
+    Returns:
+        Array of +1 (negative to positive side of line_start -> line_end),
+        -1 (positive to negative) or 0 (no crossing) per step. With image
+        coordinates and a left-to-right line, +1 means moving down.
+    """
+    c = np.asarray(line_start, dtype=np.float64)
+    d = np.asarray(line_end, dtype=np.float64)
+
+    side_start = _cross(c, d, starts) > 0
+    side_end = _cross(c, d, ends) > 0
+
+    # The line's end points must lie on opposite sides of the step (or on it)
+    within_segment = _cross(starts, ends, c) * _cross(starts, ends, d) <= 0
+
+    crossed = (side_start != side_end) & within_segment
+    return np.where(crossed, np.where(side_end, 1, -1), 0)
+
+
+def points_in_polygon(points: np.ndarray, polygon: Sequence[Point]) -> np.ndarray:
+    """
+    Even-odd rule point-in-polygon test for an (N, 2) array of points.
+    """
+    vertices = np.asarray(polygon, dtype=np.float64)
+    px, py = points[:, 0], points[:, 1]
+    inside = np.zeros(len(points), dtype=bool)
+
+    for (x1, y1), (x2, y2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        straddles = (y1 > py) != (y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_at_py = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= straddles & (px < x_at_py)
+    return inside
+
+
+def polygon_crossings(starts: np.ndarray, ends: np.ndarray, polygon: Sequence[Point]) -> np.ndarray:
+    """
+    Find trajectory steps that enter (+1) or leave (-1) a polygon zone.
+    """
+    inside_start = points_in_polygon(starts, polygon)
+    inside_end = points_in_polygon(ends, polygon)
+    return inside_end.astype(np.int8) - inside_start.astype(np.int8)
+
+
+def count_crossings(df: pd.DataFrame, lines: Optional[Dict[str, Tuple[Point, Point]]] = None,
+                    polygons: Optional[Dict[str, Sequence[Point]]] = None,
+                    anchor: str = "center", unique_tracks: bool = True) -> pd.DataFrame:
+    """
+    Compute line and zone crossing events for all tracks at once.
+
+    Args:
+        df: MOT table (see load_track_table or load_mot_file)
+        lines: Counting lines as {name: (start, end)} (default: the notebook line)
+        polygons: Counting zones as {name: [vertices]} (optional)
+        anchor: Box point that is tracked: "center" or "bottom_center"
+        unique_tracks: Count each track at most once per counter and direction,
+            so a box jittering on the line is not counted repeatedly
+
+    Returns:
+        DataFrame with columns counter, video, id, class, frame and direction
+        ("in" for +1 crossings or zone entries, "out" otherwise)
+    """
+    if lines is None and polygons is None:
+        lines = {"line": (LINE_START, LINE_END)}
+
+    starts, ends, rows = track_steps(df, anchor)
+    videos = rows["video"].astype(str).to_numpy() if "video" in rows.columns else np.full(len(rows), "")
+
+    counters = [(name, line_crossings(starts, ends, *line)) for name, line in (lines or {}).items()]
+    counters += [(name, polygon_crossings(starts, ends, polygon)) for name, polygon in (polygons or {}).items()]
+
+    events = []
+    for name, crossing in counters:
+        hit = crossing != 0
+        events.append(pd.DataFrame({
+            "counter": name,
+            "video": videos[hit],
+            "id": rows["id"].to_numpy()[hit],
+            "class": rows["class"].to_numpy()[hit],
+            "frame": rows["frame"].to_numpy()[hit],
+            "direction": np.where(crossing[hit] > 0, "in", "out"),
+        }))
+
+    events_df = pd.concat(events, ignore_index=True) if events else pd.DataFrame(columns=EVENT_COLUMNS)
+    if unique_tracks:
+        events_df = events_df.drop_duplicates(subset=["counter", "video", "id", "direction"])
+    return events_df.reset_index(drop=True)
+
+
+def summarize_counts(events_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count crossing events per counter, video, class and direction.
+    """
+    counts = events_df.groupby(COUNT_KEYS).size().rename("count").reset_index()
+    counts["class_name"] = counts["class"].map(CLASS_NAMES)
+    return counts
+
+
+def count_error(pred_counts: pd.DataFrame, gt_counts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare predicted counts with ground truth counts from summarize_counts.
+
+    Counts are compared per video, so over- and under-counting in different
+    videos do not cancel out (see rollup_count_error for totals).
+
+    Returns:
+        DataFrame per counter, video, class and direction with gt, pred, error
+        (pred - gt), abs_error and relative_error (abs_error / gt)
+    """
+    keys = COUNT_KEYS
+    merged = pd.merge(
+        gt_counts[keys + ["count"]].rename(columns={"count": "gt"}),
+        pred_counts[keys + ["count"]].rename(columns={"count": "pred"}),
+        on=keys, how="outer",
+    ).fillna({"gt": 0, "pred": 0})
+    merged[["gt", "pred"]] = merged[["gt", "pred"]].astype(int)
+
+    merged["class_name"] = merged["class"].map(CLASS_NAMES)
+    merged["error"] = merged["pred"] - merged["gt"]
+    merged["abs_error"] = merged["error"].abs()
+    merged["relative_error"] = merged["abs_error"] / merged["gt"].where(merged["gt"] > 0)
+    return merged.sort_values(keys).reset_index(drop=True)
+
+
+def rollup_count_error(error_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Roll per-video count errors from count_error up across videos.
+
+    abs_error is the sum of the per-video absolute errors, so a video that
+    over-counts does not hide one that under-counts; error is the net
+    difference of the totals.
+
+    Returns:
+        DataFrame per counter, class and direction with videos, gt, pred,
+        error, abs_error and relative_error (abs_error / gt)
+    """
+    keys = ["counter", "class", "direction"]
+    rollup = error_df.groupby(keys).agg(
+        videos=("video", "nunique"),
+        gt=("gt", "sum"),
+        pred=("pred", "sum"),
+        error=("error", "sum"),
+        abs_error=("abs_error", "sum"),
+    ).reset_index()
+
+    rollup["class_name"] = rollup["class"].map(CLASS_NAMES)
+    rollup["relative_error"] = rollup["abs_error"] / rollup["gt"].where(rollup["gt"] > 0)
+    return rollup
+
+
+def save_count_report(error_df: pd.DataFrame, output_dir: str) -> None:
+    """
+    Save the per-video count accuracy table and its roll-up across videos as CSV and JSON.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tables = {
+        "count_accuracy": error_df,
+        "count_accuracy_summary": rollup_count_error(error_df),
+    }
+
+    for name, df in tables.items():
+        csv_path = os.path.join(output_dir, f"{name}.csv")
+        json_path = os.path.join(output_dir, f"{name}.json")
+
+        df.to_csv(csv_path, index=False)
+        df.to_json(json_path, orient="records", indent=2)
+
+        print(f"[✓] Saved CSV: {csv_path}")
+        print(f"[✓] Saved JSON: {json_path}")
+
+
+if __name__ == "__main__":
+    tracking_path = "tracking.json"
+    gt_path = "main_groundtruth.json"
+    output_dir = "count_analysis_output"
+
+    lines = {"line": (LINE_START, LINE_END)}
+
+    pred_counts = summarize_counts(count_crossings(load_track_table(tracking_path), lines=lines))
+    gt_counts = summarize_counts(count_crossings(load_track_table(gt_path, default_id=-1), lines=lines))
+
+    error_df = count_error(pred_counts, gt_counts)
+    print(rollup_count_error(error_df).to_string(index=False))
+    save_count_report(error_df, output_dir)
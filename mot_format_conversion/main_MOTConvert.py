@@ -3,7 +3,65 @@ import os
 import numpy as np
 from typing import Dict, List, Any
 
-def convert_to_mot_format(tracking_path: str, gt_path: str, output_dir: str):
+from mot_columnar import MOT_COLUMNS, columnar_format, format_extension, parse_mot_filename, read_mot_table, to_mot_table, write_mot_table
+
+def write_mot_rows(rows: List[tuple], output_path: str, video: str = None, kind: str = None,
+                   run: str = None):
+    """
+    Write MOT rows to a text file, or to Parquet/Feather if the path ends in
+    .parquet/.feather.
+    
+    Args:
+        rows: Tuples of (frame, id, x, y, width, height, conf, class, x3d, y3d)
+        output_path: Path to the output file
+        video: Video name stored alongside the rows (required for columnar outputs)
+        kind: "gt" or "tracking", stored in columnar outputs (optional)
+        run: Run or job identifier stored in columnar outputs (optional)
+    """
+    if columnar_format(output_path):
+        write_mot_table(to_mot_table(rows, video=video, kind=kind, run=run), output_path)
+        return
+    
+    with open(output_path, 'w') as f:
+        for row in rows:
+            f.write(",".join(str(value) for value in row) + "\n")
+
+def video_to_mot_rows(video: Dict[str, Any], default_id: int = None) -> List[tuple]:
+    """
+    Convert one video entry of a tracking or ground truth JSON file to MOT rows.
+    
+    Args:
+        video: Video entry with a 'box' list of objects and their frame sequences
+        default_id: ID for objects without one (ground truth uses -1); if None,
+            every object must have an 'id'
+        
+    Returns:
+        Unsorted list of (frame, id, x, y, width, height, conf, class, x3d, y3d) tuples
+    """
+    rows = []
+    
+    # Process each object in the video
+    for obj in video['box']:
+        obj_id = obj['id'] if default_id is None else obj.get('id', default_id)
+        obj_class = obj['labels'][0]
+        
+        # Get class ID (1 for car, 2 for truck, etc.)
+        class_id = 1 if obj_class.lower() == 'car' else 2  # Assuming car=1, truck=2
+        
+        # Process each frame in the object's sequence
+        for frame_data in obj['sequence']:
+            if not frame_data.get('enabled', True):
+                continue  # Skip disabled frames
+            
+            # MOT format: <frame>, <id>, <bb_left>, <bb_top>, <bb_width>, <bb_height>, <conf>, <x>, <y>, <z>
+            # Confidence is set to 1.0 for both tracking predictions and ground truth
+            rows.append((frame_data['frame'], obj_id, frame_data['x'], frame_data['y'],
+                         frame_data['width'], frame_data['height'], 1.0, class_id, -1, -1))
+    
+    return rows
+
+def convert_to_mot_format(tracking_path: str, gt_path: str, output_dir: str, output_format: str = "txt",
+                          run: str = None):
     """
     Convert tracking and ground truth JSON files to MOT format text files.
     
@@ -24,6 +82,8 @@ def convert_to_mot_format(tracking_path: str, gt_path: str, output_dir: str):
         tracking_path: Path to the tracking JSON file
         gt_path: Path to the ground truth JSON file
         output_dir: Directory to save output MOT text files
+        output_format: "txt" (default), or "parquet"/"feather" for typed columnar files
+        run: Run identifier stored in columnar outputs (optional)
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -47,88 +107,27 @@ def convert_to_mot_format(tracking_path: str, gt_path: str, output_dir: str):
             continue
         
         # Create output file paths
-        tracking_output = os.path.join(output_dir, f"{video_name}_tracking.txt")
-        gt_output = os.path.join(output_dir, f"{video_name}_gt.txt")
+        ext = format_extension(output_format)
+        tracking_output = os.path.join(output_dir, f"{video_name}_tracking{ext}")
+        gt_output = os.path.join(output_dir, f"{video_name}_gt{ext}")
         
         # Convert tracking data to MOT format
-        tracking_lines = []
-        
-        # Process each object in tracking data
-        for track_obj in tracking_video['box']:
-            obj_id = track_obj['id']
-            obj_class = track_obj['labels'][0]
-            
-            # Process each frame in the object's sequence
-            for frame_data in track_obj['sequence']:
-                if not frame_data.get('enabled', True):
-                    continue  # Skip disabled frames
-                
-                frame_num = frame_data['frame']
-                
-                # Extract bounding box information
-                x = frame_data['x']
-                y = frame_data['y']
-                width = frame_data['width']
-                height = frame_data['height']
-                
-                # MOT format: <frame>, <id>, <bb_left>, <bb_top>, <bb_width>, <bb_height>, <conf>, <x>, <y>, <z>
-                # For tracking predictions, set confidence to 1.0
-                confidence = 1.0
-                
-                # Get class ID (1 for car, 2 for truck, etc.)
-                class_id = 1 if obj_class.lower() == 'car' else 2  # Assuming car=1, truck=2
-                
-                # Create MOT format line
-                line = f"{frame_num},{obj_id},{x},{y},{width},{height},{confidence},{class_id},-1,-1\n"
-                tracking_lines.append((frame_num, line))
+        tracking_lines = video_to_mot_rows(tracking_video)
         
         # Sort by frame number
         tracking_lines.sort(key=lambda x: x[0])
         
         # Write tracking data to file
-        with open(tracking_output, 'w') as f:
-            for _, line in tracking_lines:
-                f.write(line)
+        write_mot_rows(tracking_lines, tracking_output, video=video_name, kind="tracking", run=run)
         
         # Convert ground truth data to MOT format
-        gt_lines = []
-        
-        # Process each object in ground truth data
-        for gt_obj in gt_video['box']:
-            obj_id = gt_obj.get('id', -1)  # Use -1 if ID not present
-            obj_class = gt_obj['labels'][0]
-            
-            # Process each frame in the object's sequence
-            for frame_data in gt_obj['sequence']:
-                if not frame_data.get('enabled', True):
-                    continue  # Skip disabled frames
-                
-                frame_num = frame_data['frame']
-                
-                # Extract bounding box information
-                x = frame_data['x']
-                y = frame_data['y']
-                width = frame_data['width']
-                height = frame_data['height']
-                
-                # MOT format: <frame>, <id>, <bb_left>, <bb_top>, <bb_width>, <bb_height>, <conf>, <x>, <y>, <z>
-                # For ground truth, set confidence to 1.0
-                confidence = 1.0
-                
-                # Get class ID (1 for car, 2 for truck, etc.)
-                class_id = 1 if obj_class.lower() == 'car' else 2  # Assuming car=1, truck=2
-                
-                # Create MOT format line
-                line = f"{frame_num},{obj_id},{x},{y},{width},{height},{confidence},{class_id},-1,-1\n"
-                gt_lines.append((frame_num, line))
+        gt_lines = video_to_mot_rows(gt_video, default_id=-1)  # Use -1 if ID not present
         
         # Sort by frame number
         gt_lines.sort(key=lambda x: x[0])
         
         # Write ground truth data to file
-        with open(gt_output, 'w') as f:
-            for _, line in gt_lines:
-                f.write(line)
+        write_mot_rows(gt_lines, gt_output, video=video_name, kind="gt", run=run)
         
         print(f"Converted tracking data saved to {tracking_output}")
         print(f"Converted ground truth data saved to {gt_output}")
@@ -136,33 +135,17 @@ def convert_to_mot_format(tracking_path: str, gt_path: str, output_dir: str):
         # Return the generated file paths
         return tracking_output, gt_output
 
-def interpolate_mot_data(input_mot_path: str, output_mot_path: str, max_frame: int = None):
+def interpolate_mot_entries(data: List[Dict[str, Any]], max_frame: int = None) -> List[Dict[str, Any]]:
     """
-    Interpolate MOT data to fill in missing frames for each object.
+    Linearly interpolate missing frames between the first and last frame of each object.
     
     Args:
-        input_mot_path: Path to the input MOT format text file
-        output_mot_path: Path to save the interpolated MOT data
+        data: MOT entries as dicts with keys frame, id, x, y, width, height, conf, class, x3d, y3d
         max_frame: Maximum frame number to interpolate up to (optional)
+        
+    Returns:
+        Original and interpolated entries sorted by frame and then by ID
     """
-    # Read input MOT file
-    data = []
-    with open(input_mot_path, 'r') as f:
-        for line in f:
-            parts = line.strip().split(',')
-            data.append({
-                'frame': int(parts[0]),
-                'id': int(parts[1]),
-                'x': float(parts[2]),
-                'y': float(parts[3]),
-                'width': float(parts[4]),
-                'height': float(parts[5]),
-                'conf': float(parts[6]),
-                'class': int(parts[7]),
-                'x3d': float(parts[8]),
-                'y3d': float(parts[9])
-            })
-    
     # Group data by object ID
     objects = {}
     for entry in data:
@@ -230,11 +213,66 @@ def interpolate_mot_data(input_mot_path: str, output_mot_path: str, max_frame: i
     # Sort by frame and then by ID
     interpolated_data.sort(key=lambda x: (x['frame'], x['id']))
     
+    return interpolated_data
+
+def interpolate_mot_data(input_mot_path: str, output_mot_path: str, max_frame: int = None,
+                         video: str = None, kind: str = None, run: str = None):
+    """
+    Interpolate MOT data to fill in missing frames for each object.
+    
+    Args:
+        input_mot_path: Path to the input MOT format text, Parquet or Feather file
+        output_mot_path: Path to save the interpolated MOT data (format chosen by extension)
+        max_frame: Maximum frame number to interpolate up to (optional)
+        video: Video name for columnar outputs (default: taken from a columnar
+            input, or from a <video>_tracking / <video>_gt input file name)
+        kind: "gt" or "tracking" (default: derived like video)
+        run: Run identifier (default: taken from a columnar input)
+    """
+    # Read input MOT file
+    data = []
+    labels = {'video': None, 'kind': None, 'run': None}
+    if columnar_format(input_mot_path):
+        df = read_mot_table(input_mot_path)
+        for col in labels:
+            value = df[col].iloc[0] if len(df) else None
+            labels[col] = value if isinstance(value, str) else None  # Missing labels come back as NaN
+        rows = df[MOT_COLUMNS].itertuples(index=False, name=None)
+    else:
+        with open(input_mot_path, 'r') as f:
+            rows = [line.strip().split(',') for line in f]
+    
+    if labels['video'] is None:
+        labels['video'], labels['kind'] = parse_mot_filename(input_mot_path)
+    video = video or labels['video']
+    kind = kind or labels['kind']
+    run = run or labels['run']
+    if video is None and columnar_format(output_mot_path):
+        raise ValueError(f"Cannot tell the video of {input_mot_path}; pass video= for columnar output")
+    
+    for parts in rows:
+        data.append({
+            'frame': int(parts[0]),
+            'id': int(parts[1]),
+            'x': float(parts[2]),
+            'y': float(parts[3]),
+            'width': float(parts[4]),
+            'height': float(parts[5]),
+            'conf': float(parts[6]),
+            'class': int(parts[7]),
+            'x3d': float(parts[8]),
+            'y3d': float(parts[9])
+        })
+    
+    interpolated_data = interpolate_mot_entries(data, max_frame)
+    
     # Write interpolated data to output file
-    with open(output_mot_path, 'w') as f:
-        for entry in interpolated_data:
-            line = f"{entry['frame']},{entry['id']},{entry['x']},{entry['y']},{entry['width']},{entry['height']},{entry['conf']},{entry['class']},{entry['x3d']},{entry['y3d']}\n"
-            f.write(line)
+    rows = [
+        (entry['frame'], entry['id'], entry['x'], entry['y'], entry['width'], entry['height'],
+         entry['conf'], entry['class'], entry['x3d'], entry['y3d'])
+        for entry in interpolated_data
+    ]
+    write_mot_rows(rows, output_mot_path, video=video, kind=kind, run=run)
     
     print(f"Interpolated MOT data saved to {output_mot_path}")
     print(f"Number of frames interpolated: {len(interpolated_data) - len(data)}")
@@ -244,14 +282,16 @@ if __name__ == "__main__":
     tracking_path = "filtered_tracking.json"
     gt_path = "filtered_groundtruth.json"
     output_dir = "mot_output"
+    output_format = "txt"  # or "parquet" / "feather" for typed columnar files
     
     # Convert JSON to MOT format
-    tracking_mot, gt_mot = convert_to_mot_format(tracking_path, gt_path, output_dir)
+    tracking_mot, gt_mot = convert_to_mot_format(tracking_path, gt_path, output_dir, output_format)
     
     # Optionally interpolate the MOT data to fill in missing frames
     # This is useful for smooth visualization and evaluation
-    interpolated_tracking = os.path.join(output_dir, "interpolated_tracking.txt")
-    interpolated_gt = os.path.join(output_dir, "interpolated_gt.txt")
+    ext = format_extension(output_format)
+    interpolated_tracking = os.path.join(output_dir, f"interpolated_tracking{ext}")
+    interpolated_gt = os.path.join(output_dir, f"interpolated_gt{ext}")
     
     interpolate_mot_data(tracking_mot, interpolated_tracking)
     interpolate_mot_data(gt_mot, interpolated_gt)
\ No newline at end of file
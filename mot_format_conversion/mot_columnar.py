@@ -0,0 +1,289 @@
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Column names used for MOT tables (matches Evaluation_tracking_Analysis.load_mot_file)
+MOT_COLUMNS = ["frame", "id", "x", "y", "w", "h", "conf", "class", "x3d", "y3d"]
+
+# Typed schema for columnar MOT files: integer keys, float32 boxes
+MOT_DTYPES = {
+    "frame": "int32",
+    "id": "int32",
+    "x": "float32",
+    "y": "float32",
+    "w": "float32",
+    "h": "float32",
+    "conf": "float32",
+    "class": "int32",
+    "x3d": "float32",
+    "y3d": "float32",
+}
+
+# Label columns of columnar MOT files, and the allowed values of "kind"
+MOT_LABEL_COLUMNS = ["video", "kind", "run"]
+MOT_KINDS = ("gt", "tracking")
+
+# Typed schema for the frame-wise evaluation summary
+SUMMARY_DTYPES = {
+    "frame": "int32",
+    "TP": "int32",
+    "FP": "int32",
+    "FN": "int32",
+    "precision": "float32",
+    "recall": "float32",
+    "mota": "float32",
+}
+
+# Supported columnar formats, keyed by file extension
+COLUMNAR_FORMATS = {
+    ".parquet": "parquet",
+    ".feather": "feather",
+}
+
+
+def columnar_format(path: str) -> Optional[str]:
+    """
+    Return the columnar format ("parquet" or "feather") for a file path,
+    or None if the path is a plain MOT text file.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    return COLUMNAR_FORMATS.get(ext)
+
+
+def format_extension(fmt: str) -> str:
+    """
+    Return the file extension for an output format ("txt", "parquet" or "feather").
+    """
+    if fmt == "txt":
+        return ".txt"
+    for ext, name in COLUMNAR_FORMATS.items():
+        if name == fmt:
+            return ext
+    raise ValueError(f"Unsupported output format: {fmt}")
+
+
+def parse_mot_filename(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return (video, kind) from a file name written by convert_to_mot_format,
+    i.e. <video>_tracking.<ext> or <video>_gt.<ext>, or (None, None) otherwise.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = re.fullmatch(r"(?P<video>.+)_(?P<kind>tracking|gt)", stem)
+    # interpolated_<kind> (the scripts' default output names) carries no video name
+    if match is None or match.group("video") == "interpolated":
+        return None, None
+    return match.group("video"), match.group("kind")
+
+
+def mot_schema():
+    """
+    Return the Arrow schema of columnar MOT files.
+
+    Besides the MOT columns, each file records which video, kind of table
+    ("gt" or "tracking") and run (e.g. an evaluation job) its rows belong to,
+    so files from many runs can be queried together. The label columns are
+    plain strings (Parquet still dictionary-encodes them on disk), so their
+    min/max statistics let filters on them skip row groups and files.
+    """
+    import pyarrow as pa
+
+    types = {"int32": pa.int32(), "float32": pa.float32()}
+    return pa.schema(
+        [(col, pa.string()) for col in MOT_LABEL_COLUMNS]
+        + [(col, types[MOT_DTYPES[col]]) for col in MOT_COLUMNS]
+    )
+
+
+def to_mot_table(rows: Sequence[Tuple], video: Optional[str] = None, kind: Optional[str] = None,
+                 run: Optional[str] = None) -> pd.DataFrame:
+    """
+    Build a typed MOT DataFrame from row tuples in MOT column order.
+
+    Args:
+        rows: Tuples of (frame, id, x, y, w, h, conf, class, x3d, y3d)
+        video: Video name stored in the categorical "video" column (optional)
+        kind: "gt" or "tracking", stored in the "kind" column (optional)
+        run: Run or job identifier stored in the "run" column (optional)
+
+    Returns:
+        DataFrame with categorical video/kind/run, int32 frame/id/class and
+        float32 box columns
+    """
+    if kind is not None and kind not in MOT_KINDS:
+        raise ValueError(f"Unsupported MOT table kind: {kind}")
+
+    df = pd.DataFrame.from_records(list(rows), columns=MOT_COLUMNS)
+    df = df.astype(MOT_DTYPES)
+    for position, (col, value) in enumerate(zip(MOT_LABEL_COLUMNS, (video, kind, run))):
+        df.insert(position, col, pd.Categorical([value] * len(df)))
+    return df
+
+
+def write_columnar(df: pd.DataFrame, path: str, dtypes: Optional[dict] = None, schema=None,
+                   row_group_size: int = 65536) -> None:
+    """
+    Write a DataFrame to a Parquet or Feather file, chosen by extension.
+
+    Args:
+        df: DataFrame to write
+        path: Output path ending in .parquet or .feather
+        dtypes: Optional column dtypes to enforce before writing
+        schema: Optional Arrow schema to write the columns with
+        row_group_size: Parquet row group size; smaller groups give finer
+            frame-range skipping when the data is sorted by frame
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    fmt = columnar_format(path)
+    if fmt is None:
+        raise ValueError(f"Not a columnar file path: {path}")
+
+    if dtypes:
+        df = df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+    df = df.reset_index(drop=True)
+    if schema is not None:
+        # Categoricals convert to the schema's string type via plain objects
+        df = df[schema.names].astype({
+            col: object for col in schema.names if isinstance(df[col].dtype, pd.CategoricalDtype)
+        })
+
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    if fmt == "parquet":
+        pq.write_table(table, path, row_group_size=row_group_size)
+    else:
+        feather.write_feather(table, path)
+
+
+def write_mot_table(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a MOT DataFrame (see to_mot_table) to a Parquet or Feather file.
+    Every columnar MOT file must name its video.
+    """
+    if "video" not in df.columns or df["video"].isna().any():
+        raise ValueError(f"Columnar MOT file needs a video name: {path}")
+    write_columnar(df, path, schema=mot_schema())
+
+
+def _columnar_files(path: str) -> Dict[str, List[str]]:
+    """
+    List the columnar files under a directory in one recursive walk, grouped
+    by format.
+    """
+    files: Dict[str, List[str]] = {}
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        for name in sorted(names):
+            fmt = columnar_format(name)
+            if fmt is not None:
+                files.setdefault(fmt, []).append(os.path.join(root, name))
+    return files
+
+
+def _matching_dataset(sources, fmt: str, schema):
+    """
+    Build a dataset over the files whose schema matches, skipping the others
+    (e.g. frame-wise summaries next to MOT tables). Each file's footer is read
+    once by Arrow; Parquet fragments keep the metadata for the scan.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(sources, format=fmt)
+    fragments = [
+        fragment for fragment in dataset.get_fragments()
+        if _schema_matches(fragment.physical_schema, schema)
+    ]
+    return ds.FileSystemDataset(fragments, schema, dataset.format, filesystem=dataset.filesystem)
+
+
+def _schema_matches(file_schema, schema) -> bool:
+    return all(
+        file_schema.get_field_index(field.name) != -1
+        and file_schema.field(field.name).type == field.type
+        for field in schema
+    )
+
+
+def read_columnar(path: str, frame_range: Optional[Tuple[int, int]] = None,
+                  videos: Optional[Iterable[str]] = None,
+                  kinds: Optional[Iterable[str]] = None,
+                  runs: Optional[Iterable[str]] = None,
+                  columns: Optional[List[str]] = None,
+                  fmt: Optional[str] = None, schema=None) -> pd.DataFrame:
+    """
+    Read a Parquet/Feather file, or a directory tree of them, with optional filters.
+
+    Filters are pushed down to the Arrow dataset scanner, so Parquet row groups
+    whose statistics fall outside the requested frames, videos, kinds or runs
+    are skipped without being decoded. Feather files have no statistics and
+    are filtered after decoding.
+
+    Args:
+        path: A .parquet/.feather file or a directory searched recursively
+        frame_range: Inclusive (first_frame, last_frame) to keep (optional)
+        videos: Video names to keep; requires a "video" column (optional)
+        kinds: Table kinds ("gt", "tracking") to keep; requires a "kind" column (optional)
+        runs: Run or job identifiers to keep; requires a "run" column (optional)
+        columns: Subset of columns to load (optional)
+        fmt: "parquet" or "feather"; inferred from the path if not given
+        schema: Arrow schema the files must have; in a directory, other files
+            are skipped (optional)
+
+    Returns:
+        DataFrame with the matching rows
+    """
+    import pyarrow.dataset as ds
+
+    if os.path.isdir(path):
+        files = _columnar_files(path)
+        if fmt is None:
+            if len(files) != 1:
+                raise ValueError(f"Cannot infer a single columnar format in directory: {path}")
+            fmt = next(iter(files))
+        sources = files.get(fmt, [])
+        if not sources:
+            raise ValueError(f"No {fmt} files found under: {path}")
+    else:
+        fmt = fmt or columnar_format(path)
+        if fmt is None:
+            raise ValueError(f"Not a columnar file path: {path}")
+        sources = [path]
+
+    if schema is None:
+        dataset = ds.dataset(sources, format=fmt)
+    else:
+        dataset = _matching_dataset(sources, fmt, schema)
+        if not os.path.isdir(path) and not dataset.files:
+            raise ValueError(f"File does not have the expected schema: {path}")
+    if not dataset.files:
+        raise ValueError(f"No matching {fmt} files found under: {path}")
+
+    expr = None
+    if frame_range is not None:
+        first_frame, last_frame = frame_range
+        expr = (ds.field("frame") >= first_frame) & (ds.field("frame") <= last_frame)
+    for col, values in (("video", videos), ("kind", kinds), ("run", runs)):
+        if values is not None:
+            col_expr = ds.field(col).isin(list(values))
+            expr = col_expr if expr is None else expr & col_expr
+
+    table = dataset.to_table(columns=columns, filter=expr)
+    return table.to_pandas()
+
+
+def read_mot_table(path: str, frame_range: Optional[Tuple[int, int]] = None,
+                   videos: Optional[Iterable[str]] = None,
+                   kinds: Optional[Iterable[str]] = None,
+                   runs: Optional[Iterable[str]] = None,
+                   columns: Optional[List[str]] = None,
+                   fmt: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read columnar MOT tables from a file or a directory tree (e.g. the
+    evaluation service's results/ archive). Files that are not MOT tables,
+    such as frame-wise summaries, are skipped. See read_columnar for arguments.
+    """
+    return read_columnar(path, frame_range=frame_range, videos=videos, kinds=kinds, runs=runs,
+                         columns=columns, fmt=fmt, schema=mot_schema())
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from line_counting import count_crossings, count_error, rollup_count_error, summarize_counts
+from mot_columnar import to_mot_table
+
+
+def _track_table(crossings_per_video):
+    """
+    Build a track table where each track moves down across the default counting line.
+    """
+    tables = []
+    for video, num_tracks in crossings_per_video.items():
+        rows = []
+        for track_id in range(1, num_tracks + 1):
+            rows.append((1, track_id, 1000.0, 1300.0, 100.0, 100.0, 1.0, 1, -1, -1))
+            rows.append((2, track_id, 1000.0, 1600.0, 100.0, 100.0, 1.0, 1, -1, -1))
+        tables.append(to_mot_table(rows, video=video))
+    return pd.concat(tables, ignore_index=True)
+
+
+def _count_error(gt_crossings, pred_crossings):
+    gt_counts = summarize_counts(count_crossings(_track_table(gt_crossings)))
+    pred_counts = summarize_counts(count_crossings(_track_table(pred_crossings)))
+    return count_error(pred_counts, gt_counts)
+
+
+def test_count_error_is_per_video():
+    error_df = _count_error({"A": 1, "B": 2}, {"A": 2, "B": 1})
+
+    by_video = error_df.set_index("video")
+    assert by_video.loc["A", ["gt", "pred", "error"]].tolist() == [1, 2, 1]
+    assert by_video.loc["B", ["gt", "pred", "error"]].tolist() == [2, 1, -1]
+
+
+def test_rollup_sums_absolute_per_video_errors():
+    rollup = rollup_count_error(_count_error({"A": 1, "B": 2}, {"A": 2, "B": 1}))
+
+    assert len(rollup) == 1
+    row = rollup.iloc[0]
+    assert (row["videos"], row["gt"], row["pred"]) == (2, 3, 3)
+    assert row["error"] == 0
+    assert row["abs_error"] == 2
+    assert row["relative_error"] == 2 / 3
+
+
+def test_video_missing_from_predictions_counts_as_error():
+    error_df = _count_error({"A": 1, "B": 2}, {"A": 1})
+
+    by_video = error_df.set_index("video")
+    assert by_video.loc["B", ["gt", "pred", "abs_error"]].tolist() == [2, 0, 2]
+    assert rollup_count_error(error_df).iloc[0]["abs_error"] == 2